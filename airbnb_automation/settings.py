@@ -54,6 +54,9 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', '1234'),
         'HOST':     os.getenv('DB_HOST',     'localhost'),
         'PORT':     os.getenv('DB_PORT',     '5432'),
+        # Keep one warm connection per process instead of reconnecting per query
+        'CONN_MAX_AGE':       int(os.getenv('DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -66,3 +69,4 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom settings loaded from .env
 AIRBNB_URL     = os.getenv('AIRBNB_URL',     'https://www.airbnb.com/')
 SCREENSHOT_DIR = os.path.join(BASE_DIR, os.getenv('SCREENSHOT_DIR', 'screenshots'))
+BULK_BATCH_SIZE = int(os.getenv('BULK_BATCH_SIZE', '500'))   # rows per bulk INSERT
@@ -1,10 +1,88 @@
 from django.contrib import admin
-from .models import TestResult, ListingData, SuggestionData, NetworkLog, ConsoleLog
+from django.core.paginator import Paginator
+from django.db      import connections
+from django.urls    import reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+from .models import (
+    AutomationSession, TestResult, ListingData, SuggestionData, NetworkLog, ConsoleLog
+)
+
+
+class DisplayedColumnsAdmin(admin.ModelAdmin):
+    """
+    Changelist pages SELECT only the columns named in `list_display`
+    and skip the extra unfiltered COUNT(*) Django runs by default.
+    """
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        qs    = super().get_queryset(request)
+        match = request.resolver_match
+        if match and (match.url_name or '').endswith('_changelist'):
+            columns = {f.name for f in self.model._meta.concrete_fields}
+            qs = qs.only(*(c for c in self.list_display if c in columns))
+        return qs
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    For unfiltered changelists of big PostgreSQL tables, use the planner's
+    row estimate (pg_class.reltuples) instead of a full COUNT(*) scan.
+    Small or filtered querysets still get an exact count.
+    """
+    ESTIMATE_THRESHOLD = 10_000
+
+    @cached_property
+    def count(self):
+        qs   = self.object_list
+        conn = connections[qs.db]
+        if conn.vendor == 'postgresql' and not qs.query.where:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [qs.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.ESTIMATE_THRESHOLD:
+                return row[0]
+        return super().count
+
+
+class TestResultInline(admin.TabularInline):
+    model           = TestResult
+    fields          = ('test_case', 'passed', 'comment')
+    readonly_fields = fields
+    extra           = 0
+    can_delete      = False
+    show_change_link = True
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(AutomationSession)
+class AutomationSessionAdmin(DisplayedColumnsAdmin):
+    list_display  = ('id', 'started_at', 'mode', 'headless', 'target_url', 'log_links')
+    list_filter   = ('mode', 'headless')
+    ordering      = ('-id',)
+    inlines       = [TestResultInline]
+
+    @admin.display(description='Logs')
+    def log_links(self, obj):
+        # Link to the filtered changelists rather than inlining thousands of rows
+        return format_html(
+            '<a href="{}?session__id__exact={}">console</a> · '
+            '<a href="{}?session__id__exact={}">network</a>',
+            reverse('admin:automation_consolelog_changelist'), obj.pk,
+            reverse('admin:automation_networklog_changelist'), obj.pk,
+        )
 
 
 @admin.register(TestResult)
-class TestResultAdmin(admin.ModelAdmin):
-    list_display   = ('id', 'test_case', 'passed', 'comment')
+class TestResultAdmin(DisplayedColumnsAdmin):
+    list_display   = ('id', 'session', 'test_case', 'passed', 'comment')
+    list_select_related = ('session',)
     list_filter    = ('passed',)
     search_fields  = ('test_case', 'comment')
     ordering       = ('-id',)
@@ -12,28 +90,34 @@ class TestResultAdmin(admin.ModelAdmin):
 
 
 @admin.register(ListingData)
-class ListingDataAdmin(admin.ModelAdmin):
-    list_display  = ('id', 'title', 'price', 'listing_url', 'scraped_at')
+class ListingDataAdmin(DisplayedColumnsAdmin):
+    list_display  = ('id', 'session', 'title', 'price', 'listing_url', 'scraped_at')
+    list_select_related = ('session',)
     search_fields = ('title',)
     ordering      = ('-scraped_at',)
 
 
 @admin.register(SuggestionData)
-class SuggestionDataAdmin(admin.ModelAdmin):
-    list_display  = ('id', 'search_query', 'text', 'captured_at')
+class SuggestionDataAdmin(DisplayedColumnsAdmin):
+    list_display  = ('id', 'session', 'search_query', 'text', 'captured_at')
+    list_select_related = ('session',)
     search_fields = ('search_query', 'text')
     ordering      = ('-captured_at',)
 
 
 @admin.register(NetworkLog)
-class NetworkLogAdmin(admin.ModelAdmin):
-    list_display  = ('id', 'method', 'status_code', 'resource_type', 'url', 'captured_at')
+class NetworkLogAdmin(DisplayedColumnsAdmin):
+    list_display  = ('id', 'session', 'method', 'status_code', 'resource_type', 'url', 'captured_at')
+    list_select_related = ('session',)
     list_filter   = ('method', 'status_code')
     ordering      = ('-captured_at',)
+    paginator     = EstimatedCountPaginator
 
 
 @admin.register(ConsoleLog)
-class ConsoleLogAdmin(admin.ModelAdmin):
-    list_display  = ('id', 'level', 'message', 'captured_at')
+class ConsoleLogAdmin(DisplayedColumnsAdmin):
+    list_display  = ('id', 'session', 'level', 'message', 'captured_at')
+    list_select_related = ('session',)
     list_filter   = ('level',)
     ordering      = ('-captured_at',)
+    paginator     = EstimatedCountPaginator
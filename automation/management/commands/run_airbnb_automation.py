@@ -8,6 +8,7 @@ Usage:
     python manage.py run_airbnb_automation --headless   # no window
     python manage.py run_airbnb_automation --mobile     # iPhone 14 Pro
     python manage.py run_airbnb_automation --mobile --headless
+    python manage.py run_airbnb_automation --slow-mo 80   # slow down for debugging
 
 ═══════════════════════════════════════════════════════════════
 CRITICAL FIX — Why os.environ["DJANGO_ALLOW_ASYNC_UNSAFE"] is here
@@ -33,6 +34,7 @@ import logging
 
 from django.core.management.base import BaseCommand
 from django.conf                  import settings
+from django.db                    import transaction
 
 from automation.services.browser_service   import BrowserService
 from automation.services.database_service  import DatabaseService
@@ -51,6 +53,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ─── Console output separators (built once) ──────────────────────────────────
+SEP_HEAVY = '═' * 62
+SEP_LIGHT = '─' * 62
+BOX_LINE  = '─' * 60
+
 
 class Command(BaseCommand):
     help = (
@@ -75,6 +82,13 @@ class Command(BaseCommand):
             default=False,
             help='[BONUS] Emulate iPhone 14 Pro mobile device.',
         )
+        parser.add_argument(
+            '--slow-mo',
+            type=int,
+            default=0,
+            metavar='MS',
+            help='Delay every Playwright action by MS milliseconds (debugging). Default: 0.',
+        )
 
     # ─────────────────────────────────────────────────────────────────────────
     # Entry point
@@ -83,19 +97,25 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         headless   = options['headless']
         mobile     = options['mobile']
+        slow_mo    = options['slow_mo']
         target_url = settings.AIRBNB_URL
 
         self.stdout.write(self.style.SUCCESS(
-            f"\n{'═' * 62}\n"
+            f"\n{SEP_HEAVY}\n"
             f"  🏠  Airbnb End-to-End Automation\n"
             f"  Framework : Python Playwright + Django\n"
             f"  Mode      : {'📱 Mobile (iPhone 14 Pro)' if mobile else '🖥  Desktop (1440×900)'}\n"
             f"  Browser   : {'Headless (no window)' if headless else 'Visible window'}\n"
             f"  Target    : {target_url}\n"
-            f"{'═' * 62}\n"
+            f"{SEP_HEAVY}\n"
         ))
 
         db = DatabaseService()
+        db.start_session(
+            mode='mobile' if mobile else 'desktop',
+            headless=headless,
+            target_url=target_url,
+        )
 
         # Log session start
         db.save_result(
@@ -109,11 +129,13 @@ class Command(BaseCommand):
         )
 
         try:
-            with BrowserService(headless=headless, mobile=mobile) as browser:
+            with BrowserService(headless=headless, mobile=mobile, slow_mo=slow_mo) as browser:
                 self._run_journey(browser, db, target_url)
 
         except KeyboardInterrupt:
             self.stdout.write(self.style.WARNING('\n⚠  Stopped by user (Ctrl+C).'))
+            # Land the interrupted step's queued results before the end row
+            db.wait_for_writes(raise_errors=False)
             db.save_result(
                 test_case='Automation Session End',
                 url=target_url,
@@ -124,6 +146,8 @@ class Command(BaseCommand):
 
         except Exception as exc:
             logger.error(f"Unhandled error: {exc}", exc_info=True)
+            # Land the failing step's queued results before the end row
+            db.wait_for_writes(raise_errors=False)
             db.save_result(
                 test_case='Automation Session End',
                 url=target_url,
@@ -134,6 +158,9 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f'\n❌  Automation failed: {exc}'))
             raise
 
+        finally:
+            db.close_writer()
+
     # ─────────────────────────────────────────────────────────────────────────
     # Journey runner — executes all 6 steps in sequence
     # ─────────────────────────────────────────────────────────────────────────
@@ -146,26 +173,33 @@ class Command(BaseCommand):
     ):
         def header(n: int, title: str):
             self.stdout.write(self.style.HTTP_INFO(
-                f"\n┌{'─' * 60}┐\n"
+                f"\n┌{BOX_LINE}┐\n"
                 f"│  Step {n:02d} — {title:<50}│\n"
-                f"└{'─' * 60}┘"
+                f"└{BOX_LINE}┘"
             ))
 
+        # Each step's results are queued and written with one INSERT when the
+        # step ends (also on failure), on a writer thread while the next
+        # step drives the page.
+
         # ── Step 01 ───────────────────────────────────────────────────────────
         header(1, 'Website Landing and Initial Search Setup')
-        country = Step01LandingAndSearch(browser, db, target_url).run()
+        with db.batched_results():
+            country = Step01LandingAndSearch(browser, db, target_url).run()
         self.stdout.write(self.style.SUCCESS(f"  ✓  Country randomly selected: {country}"))
 
         # ── Step 02 ───────────────────────────────────────────────────────────
         header(2, 'Search Auto-suggestion Verification')
-        s2_ok = Step02AutoSuggestion(browser, db).run(country)
+        with db.batched_results():
+            s2_ok = Step02AutoSuggestion(browser, db).run(country)
         self.stdout.write(self.style.SUCCESS(
             f"  {'✓  Suggestion clicked' if s2_ok else '⚠  Suggestion had issues — continuing'}"
         ))
 
         # ── Step 03 ───────────────────────────────────────────────────────────
         header(3, 'Date Picker Interaction')
-        dates = Step03DatePicker(browser, db).run()
+        with db.batched_results():
+            dates = Step03DatePicker(browser, db).run()
         self.stdout.write(self.style.SUCCESS(
             f"  ✓  Check-in  date : {dates.get('checkin',  'N/A')}\n"
             f"  ✓  Check-out date : {dates.get('checkout', 'N/A')}"
@@ -173,51 +207,60 @@ class Command(BaseCommand):
 
         # ── Step 04 ───────────────────────────────────────────────────────────
         header(4, 'Guest Picker Interaction')
-        guests = Step04GuestPicker(browser, db).run()
+        with db.batched_results():
+            guests = Step04GuestPicker(browser, db).run()
         self.stdout.write(self.style.SUCCESS(f"  ✓  Total guests added: {guests}"))
 
         # ── Step 05 ───────────────────────────────────────────────────────────
         header(5, 'Refine Search and Item List Verification')
-        listings = Step05SearchResults(browser, db).run(dates, guests)
+        with db.batched_results():
+            listings = Step05SearchResults(browser, db).run(dates, guests)
         self.stdout.write(self.style.SUCCESS(f"  ✓  Listings scraped: {len(listings)}"))
 
         # ── Step 06 ───────────────────────────────────────────────────────────
         header(6, 'Item Details Page Verification')
-        details = Step06ListingDetails(browser, db).run(listings)
+        with db.batched_results():
+            details = Step06ListingDetails(browser, db).run(listings)
         self.stdout.write(self.style.SUCCESS(
             f"  ✓  Title   : {details.get('title',    'N/A')[:55]}\n"
             f"  ✓  Subtitle: {details.get('subtitle', 'N/A')[:55]}\n"
             f"  ✓  Images  : {len(details.get('image_urls', []))} gallery images"
         ))
 
-        # ── Save console & network logs collected throughout the session ───────
-        self.stdout.write(self.style.HTTP_INFO("\n  Saving monitoring logs..."))
-        if browser.console_logs:
-            db.save_console_logs(browser.console_logs)
-            self.stdout.write(self.style.SUCCESS(
-                f"  ✓  Console logs : {len(browser.console_logs)} entries saved"
-            ))
-        if browser.network_logs:
-            db.save_network_logs(browser.network_logs)
-            self.stdout.write(self.style.SUCCESS(
-                f"  ✓  Network logs : {len(browser.network_logs)} entries saved"
-            ))
+        # Every step flushes on a writer thread — let those INSERTs land first
+        db.wait_for_writes()
 
-        # ── Log session end ───────────────────────────────────────────────────
-        db.save_result(
-            test_case='Automation Session End',
-            url=browser.get_url(),
-            passed=True,
-            should_be='All 6 automation steps to complete and all data stored in database',
-            found=(
-                f"Complete — country={country} | "
-                f"checkin={dates.get('checkin')} | "
-                f"checkout={dates.get('checkout')} | "
-                f"guests={guests} | "
-                f"listings={len(listings)} | "
-                f"title={details.get('title', '')[:40]}"
-            ),
-        )
+        # ── Persist monitoring logs + session end in one commit ──────────────
+        with transaction.atomic():
+            self.stdout.write(self.style.HTTP_INFO("\n  Saving monitoring logs..."))
+            console_saved, network_saved = db.save_session_logs(
+                browser.console_logs, browser.network_logs,
+            )
+            if browser.console_logs:
+                self.stdout.write(self.style.SUCCESS(
+                    f"  ✓  Console logs : {console_saved} entries saved"
+                ))
+            if browser.network_logs:
+                self.stdout.write(self.style.SUCCESS(
+                    f"  ✓  Network logs : {network_saved} entries saved "
+                    f"({len(browser.network_logs)} captured)"
+                ))
+
+            # ── Log session end ───────────────────────────────────────────────
+            db.save_result(
+                test_case='Automation Session End',
+                url=browser.get_url(),
+                passed=True,
+                should_be='All 6 automation steps to complete and all data stored in database',
+                found=(
+                    f"Complete — country={country} | "
+                    f"checkin={dates.get('checkin')} | "
+                    f"checkout={dates.get('checkout')} | "
+                    f"guests={guests} | "
+                    f"listings={len(listings)} | "
+                    f"title={details.get('title', '')[:40]}"
+                ),
+            )
 
         self._print_final_summary()
 
@@ -226,19 +269,25 @@ class Command(BaseCommand):
     # ─────────────────────────────────────────────────────────────────────────
 
     def _print_final_summary(self):
+        from django.db.models import Count, Q
         from automation.models import TestResult
-        total  = TestResult.objects.count()
-        passed = TestResult.objects.filter(passed=True).count()
+        # One scan, both numbers: COUNT(*) and COUNT(*) FILTER (WHERE passed)
+        agg    = TestResult.objects.aggregate(
+            total=Count('id'),
+            passed=Count('id', filter=Q(passed=True)),
+        )
+        total  = agg['total']
+        passed = agg['passed']
         failed = total - passed
 
         self.stdout.write(self.style.SUCCESS(
-            f"\n{'═' * 62}\n"
+            f"\n{SEP_HEAVY}\n"
             f"  ✅  AUTOMATION COMPLETE\n"
-            f"{'─' * 62}\n"
+            f"{SEP_LIGHT}\n"
             f"  Total Test Cases : {total}\n"
             f"  Passed  ✅       : {passed}\n"
             f"  Failed  ❌       : {failed}\n"
-            f"{'─' * 62}\n"
+            f"{SEP_LIGHT}\n"
             f"  🌐  Admin panel at       : http://127.0.0.1:8000/admin/\n"
-            f"{'═' * 62}\n"
+            f"{SEP_HEAVY}\n"
         ))
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0002_alter_consolelog_options_alter_listingdata_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='consolelog',
+            index=models.Index(fields=['-captured_at'], name='console_log_capture_aa739b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingdata',
+            index=models.Index(fields=['-scraped_at'], name='listing_dat_scraped_ebe172_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='networklog',
+            index=models.Index(fields=['-captured_at'], name='network_log_capture_1715e1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='suggestiondata',
+            index=models.Index(fields=['-captured_at'], name='suggestion__capture_5fa49b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testresult',
+            index=models.Index(fields=['passed', '-id'], name='testing_passed_f552f9_idx'),
+        ),
+    ]
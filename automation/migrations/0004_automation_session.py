@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0003_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutomationSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('mode', models.CharField(choices=[('desktop', 'Desktop'), ('mobile', 'Mobile')], default='desktop', max_length=10)),
+                ('headless', models.BooleanField(default=False)),
+                ('target_url', models.URLField(max_length=2048)),
+            ],
+            options={
+                'verbose_name': 'Automation Session',
+                'verbose_name_plural': 'Automation Sessions',
+                'db_table': 'automation_sessions',
+            },
+        ),
+        migrations.AddField(
+            model_name='consolelog',
+            name='session',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='console_logs', to='automation.automationsession'),
+        ),
+        migrations.AddField(
+            model_name='listingdata',
+            name='session',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='listings', to='automation.automationsession'),
+        ),
+        migrations.AddField(
+            model_name='networklog',
+            name='session',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='network_logs', to='automation.automationsession'),
+        ),
+        migrations.AddField(
+            model_name='suggestiondata',
+            name='session',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='suggestions', to='automation.automationsession'),
+        ),
+        migrations.AddField(
+            model_name='testresult',
+            name='session',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='test_results', to='automation.automationsession'),
+        ),
+    ]
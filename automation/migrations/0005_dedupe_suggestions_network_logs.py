@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:09
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0004_automation_session'),
+    ]
+
+    operations = [
+        # Drop existing duplicates (keeping the oldest row) so the unique
+        # indexes below can be built on tables filled by earlier runs.
+        migrations.RunSQL(
+            sql="""
+                DELETE FROM "network_logs" a
+                USING "network_logs" b
+                WHERE a."id" > b."id"
+                  AND a."url" = b."url"
+                  AND a."method" = b."method"
+                  AND a."status_code" = b."status_code";
+                DELETE FROM "suggestion_data" a
+                USING "suggestion_data" b
+                WHERE a."id" > b."id"
+                  AND a."search_query" = b."search_query"
+                  AND a."text" = b."text";
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterUniqueTogether(
+            name='networklog',
+            unique_together={('url', 'method', 'status_code')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='suggestiondata',
+            unique_together={('search_query', 'text')},
+        ),
+    ]
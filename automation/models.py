@@ -1,6 +1,28 @@
 from django.db import models
 
 
+class AutomationSession(models.Model):
+    """
+    One run of the `run_airbnb_automation` command.
+    Every row written during the run points back here.
+    Table: automation_sessions
+    """
+    MODE_CHOICES = [('desktop', 'Desktop'), ('mobile', 'Mobile')]
+    started_at = models.DateTimeField(auto_now_add=True)
+    mode       = models.CharField(max_length=10, choices=MODE_CHOICES, default='desktop')
+    headless   = models.BooleanField(default=False)
+    target_url = models.URLField(max_length=2048)
+
+    class Meta:
+        db_table         = 'automation_sessions'
+        verbose_name     = 'Automation Session'
+        verbose_name_plural = 'Automation Sessions'
+
+    def __str__(self):
+        headless = ' headless' if self.headless else ''
+        return f"#{self.pk} {self.mode}{headless} @ {self.started_at:%Y-%m-%d %H:%M}"
+
+
 class TestResult(models.Model):
     """
     Main results table — stores every test case result.
@@ -11,11 +33,16 @@ class TestResult(models.Model):
     url        = models.URLField(max_length=2048)
     passed     = models.BooleanField(default=False)
     comment    = models.TextField(blank=True)
+    session    = models.ForeignKey(
+        AutomationSession, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='test_results',
+    )
 
     class Meta:
         db_table         = 'testing'
         verbose_name     = 'Test Result'
         verbose_name_plural = 'Test Results'
+        indexes          = [models.Index(fields=['passed', '-id'])]
 
     def __str__(self):
         return f"[{'PASS' if self.passed else 'FAIL'}] {self.test_case}"
@@ -28,11 +55,16 @@ class ListingData(models.Model):
     image_url   = models.URLField(max_length=2048, blank=True)
     listing_url = models.URLField(max_length=2048, blank=True)
     scraped_at  = models.DateTimeField(auto_now_add=True)
+    session     = models.ForeignKey(
+        AutomationSession, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='listings',
+    )
 
     class Meta:
         db_table         = 'listing_data'
         verbose_name     = 'Listing'
         verbose_name_plural = 'Listings'
+        indexes          = [models.Index(fields=['-scraped_at'])]
 
     def __str__(self):
         return self.title
@@ -43,11 +75,17 @@ class SuggestionData(models.Model):
     text         = models.CharField(max_length=512)
     search_query = models.CharField(max_length=255)
     captured_at  = models.DateTimeField(auto_now_add=True)
+    session      = models.ForeignKey(
+        AutomationSession, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='suggestions',
+    )
 
     class Meta:
         db_table         = 'suggestion_data'
         verbose_name     = 'Suggestion'
         verbose_name_plural = 'Suggestions'
+        unique_together  = (('search_query', 'text'),)
+        indexes          = [models.Index(fields=['-captured_at'])]
 
     def __str__(self):
         return f"{self.search_query} → {self.text}"
@@ -64,11 +102,17 @@ class NetworkLog(models.Model):
     status_code   = models.IntegerField(null=True, blank=True)
     resource_type = models.CharField(max_length=50, blank=True)
     captured_at   = models.DateTimeField(auto_now_add=True)
+    session       = models.ForeignKey(
+        AutomationSession, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='network_logs',
+    )
 
     class Meta:
         db_table         = 'network_logs'
         verbose_name     = 'Network Log'
         verbose_name_plural = 'Network Logs'
+        unique_together  = (('url', 'method', 'status_code'),)
+        indexes          = [models.Index(fields=['-captured_at'])]
 
     def __str__(self):
         return f"{self.method} [{self.status_code}] {self.url[:60]}"
@@ -84,11 +128,16 @@ class ConsoleLog(models.Model):
     message     = models.TextField()
     source      = models.CharField(max_length=512, blank=True)
     captured_at = models.DateTimeField(auto_now_add=True)
+    session     = models.ForeignKey(
+        AutomationSession, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='console_logs',
+    )
 
     class Meta:
         db_table         = 'console_logs'
         verbose_name     = 'Console Log'
         verbose_name_plural = 'Console Logs'
+        indexes          = [models.Index(fields=['-captured_at'])]
 
     def __str__(self):
         return f"[{self.level}] {self.message[:80]}"
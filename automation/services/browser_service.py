@@ -16,12 +16,124 @@ THE FIX:
 
 This means the browser stays on the Airbnb homepage without any refresh.
 """
+import re
 import logging
+from collections import deque
 
-from playwright.sync_api import sync_playwright, Page, BrowserContext
+from playwright.sync_api import sync_playwright, Page, BrowserContext, CDPSession
 
 logger = logging.getLogger(__name__)
 
+# Only page/API traffic is worth recording; images, fonts, CSS etc. are noise
+_LOGGED_RESOURCE_TYPES = frozenset({'document', 'xhr', 'fetch'})
+
+# Chromium flags: nothing in a scripted scraping run needs the GPU, the
+# zygote process or background services, and dropping them cuts CPU and
+# startup time. (--single-process is deliberately absent: Playwright
+# browser contexts do not work with it.)
+_CHROMIUM_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--lang=en-US',
+    '--disable-extensions',
+    '--disable-gpu',
+    '--disable-accelerated-2d-canvas',
+    '--no-first-run',
+    '--no-zygote',
+    '--disable-background-networking',
+    '--disable-renderer-backgrounding',
+]
+
+# Injected into every document before page scripts run. Parsed once per
+# page load, so the per-call expressions sent later stay tiny.
+_INIT_SCRIPT = """
+Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+window.__auto = {
+    lastSize: '',
+    bottom() {
+        this.lastSize = '';
+        window.scrollTo(0, document.body.scrollHeight);
+    },
+    top() { window.scrollTo(0, 0); },
+    // True once page height and image count are unchanged since the last poll
+    settled() {
+        const size = document.body.scrollHeight + ':' + document.images.length;
+        const settled = this.lastSize === size;
+        this.lastSize = size;
+        return settled;
+    },
+    clearStorage() {
+        try { window.localStorage.clear(); } catch (e) {}
+        try { window.sessionStorage.clear(); } catch (e) {}
+    },
+};
+"""
+
+# Popup/banner/modal close controls, resolved as ONE locator per probe:
+# structural CSS matches OR'ed with accessible button names
+_POPUP_CLOSE_CSS = (
+    ":is([data-testid='modal-container'] button:first-child, "
+    "[data-testid='closeButton']) >> visible=true"
+)
+_POPUP_CLOSE_NAMES = re.compile(
+    r'^\s*(?:accept all|accept|got it|dismiss|not now|skip|no thanks|close)\s*$', re.I
+)
+
+# Runs in the page: text of the first rendered match (selectors tried in
+# order) that is non-empty and not one of the lowercased `ignore` texts
+_FIRST_VISIBLE_TEXT_JS = """
+    ([selectors, ignore]) => {
+        for (const sel of selectors) {
+            for (const el of document.querySelectorAll(sel)) {
+                if (!el.getClientRects().length) continue;
+                const text = (el.innerText || '').trim();
+                if (text && !ignore.includes(text.toLowerCase())) return text;
+            }
+        }
+        return '';
+    }
+"""
+
+# Marks the first visible element among prioritised candidates so it can be
+# clicked through a plain locator. Each candidate is [css, text]; a non-empty
+# text must appear in the element's own text (the innermost element holding
+# it wins, like Playwright's :text()). Candidates are tried in list order,
+# not DOM order, which a selector union cannot guarantee.
+_PICK_ATTR = 'data-auto-pick'
+_PICK_FIRST_VISIBLE_JS = """
+    (candidates) => {
+        const norm = el => (el.textContent || '').replace(/\\s+/g, ' ').toLowerCase();
+        for (const [css, text] of candidates) {
+            for (const el of document.querySelectorAll(css)) {
+                if (text && (!norm(el).includes(text)
+                             || [...el.children].some(c => norm(c).includes(text)))) continue;
+                if (!el.getClientRects().length) continue;
+                document.querySelectorAll('[%s]').forEach(e => e.removeAttribute('%s'));
+                el.setAttribute('%s', '');
+                return css;
+            }
+        }
+        return '';
+    }
+""" % (_PICK_ATTR, _PICK_ATTR, _PICK_ATTR)
+
+# Playwright console message type → ConsoleLog level
+_CONSOLE_LEVELS = {
+    'log': 'INFO', 'info': 'INFO',
+    'warning': 'WARNING', 'error': 'ERROR', 'debug': 'DEBUG',
+}
+
+# Upper bounds for the in-memory log buffers
+CONSOLE_LOG_LIMIT = 5_000
+NETWORK_LOG_LIMIT = 10_000
+
+# Added in headless runs: scraping reads <img> attributes, never the image
+# bytes. A launch switch rather than context.route(), which would turn off
+# the HTTP cache for every request in the context.
+_HEADLESS_ARGS = ['--blink-settings=imagesEnabled=false']
+
 
 class BrowserService:
     """
@@ -29,18 +141,22 @@ class BrowserService:
     Use as a context manager: `with BrowserService() as browser:`
     """
 
-    def __init__(self, headless: bool = False, mobile: bool = False):
+    def __init__(self, headless: bool = False, mobile: bool = False, slow_mo: int = 0):
         self.headless       = headless
         self.mobile         = mobile
+        self.slow_mo        = slow_mo
 
         self._pw:      object        = None
         self._browser: object        = None
         self._context: BrowserContext = None
+        self._cdp:     CDPSession     = None
         self.page:     Page           = None
 
-        # Live log buffers — populated automatically by event listeners
-        self.console_logs: list = []
-        self.network_logs: list = []
+        # Live log buffers — populated automatically by event listeners.
+        # Bounded so a chatty page cannot grow memory without limit; the
+        # oldest entries are dropped first.
+        self.console_logs: deque = deque(maxlen=CONSOLE_LOG_LIMIT)
+        self.network_logs: deque = deque(maxlen=NETWORK_LOG_LIMIT)
 
     # ─────────────────────────────────────────────────────────────────────────
     # Context manager
@@ -51,14 +167,8 @@ class BrowserService:
 
         self._browser = self._pw.chromium.launch(
             headless=self.headless,
-            slow_mo=80,          # gives page JS time to settle between actions
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled',
-                '--lang=en-US',
-                '--disable-extensions',
-            ],
+            slow_mo=self.slow_mo,    # debugging aid only — 0 in normal runs
+            args=_CHROMIUM_ARGS + (_HEADLESS_ARGS if self.headless else []),
         )
 
         if self.mobile:
@@ -76,18 +186,19 @@ class BrowserService:
                 ),
             )
 
-        # Hide the webdriver fingerprint
-        self._context.add_init_script(
-            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-        )
+        # Hide the webdriver fingerprint and install the window.__auto helpers
+        self._context.add_init_script(_INIT_SCRIPT)
 
         self.page = self._context.new_page()
         self.page.set_default_timeout(25_000)
         self.page.set_default_navigation_timeout(30_000)
 
+        # Raw DevTools channel for simple expressions — skips Playwright's
+        # function wrapping/serialisation layer used by page.evaluate()
+        self._cdp = self._context.new_cdp_session(self.page)
+
         # Attach listeners — these fire automatically throughout the session
-        self.page.on('console',  self._capture_console)
-        self.page.on('response', self._capture_network)
+        self._attach_listeners(self.page)
 
         logger.info(f"Browser launched  headless={self.headless}  mobile={self.mobile}")
         return self
@@ -105,29 +216,33 @@ class BrowserService:
     # Log capture listeners (attached in __enter__)
     # ─────────────────────────────────────────────────────────────────────────
 
+    def _attach_listeners(self, page: Page):
+        page.on('console',         self._capture_console)
+        page.on('response',        self._capture_network)
+
     def _capture_console(self, msg):
-        level_map = {
-            'log': 'INFO', 'info': 'INFO',
-            'warning': 'WARNING', 'error': 'ERROR', 'debug': 'DEBUG',
-        }
         self.console_logs.append({
-            'level':   level_map.get(msg.type, 'INFO'),
+            'level':   _CONSOLE_LEVELS.get(msg.type, 'INFO'),
             'message': msg.text[:2000],
             'source':  '',
         })
 
     def _capture_network(self, response):
+        request = response.request
+        # Most traffic is images/fonts/CSS — drop it before reading anything else
+        if request.resource_type not in _LOGGED_RESOURCE_TYPES:
+            return
         url = response.url
         if url.startswith('data:') or url.startswith('blob:'):
             return
-        method = response.request.method.upper()
+        method = request.method.upper()
         if method not in ('GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'OPTIONS'):
             method = 'GET'
         self.network_logs.append({
             'url':           url[:2048],
             'method':        method,
             'status_code':   response.status,
-            'resource_type': response.request.resource_type,
+            'resource_type': request.resource_type,
         })
 
     # ─────────────────────────────────────────────────────────────────────────
@@ -142,12 +257,45 @@ class BrowserService:
             logger.info(f"Skipped navigation to same URL: {url}")
             return
         self.page.goto(url, wait_until='domcontentloaded', timeout=30_000)
-        self.page.wait_for_timeout(2000)          # extra settle time
+        # Settle until the network goes quiet, capped at the old fixed 2 s sleep
+        try:
+            self.page.wait_for_load_state('networkidle', timeout=2000)
+        except Exception:
+            pass
         logger.info(f"Navigated to: {url}")
 
     def get_url(self) -> str:
         return self.page.url
 
+    def open_tabs(self, urls: list) -> list:
+        """
+        Open each URL in its own tab of the current context with overlapping
+        page loads: every navigation is kicked off in-page without waiting
+        for a response, then all of them are awaited, so N pages take roughly
+        as long as the slowest one instead of the sum.
+        Callers must close the returned pages.
+        """
+        tabs = []
+        for url in urls:
+            tab = self._context.new_page()
+            self._attach_listeners(tab)
+            try:
+                # goto() would block until this tab's response headers arrive
+                tab.evaluate("u => { location.href = u }", url)
+            except Exception as e:
+                logger.warning(f"Tab navigation failed for {url}: {e}")
+            tabs.append(tab)
+        for tab in tabs:
+            try:
+                tab.wait_for_url(
+                    lambda u: not u.startswith('about:'),
+                    wait_until='domcontentloaded', timeout=30_000,
+                )
+            except Exception as e:
+                logger.warning(f"Tab did not finish loading {tab.url}: {e}")
+        logger.info(f"Opened {len(tabs)} tabs in parallel")
+        return tabs
+
     # ─────────────────────────────────────────────────────────────────────────
     # Storage clear  ← THE CRITICAL FIX
     # ─────────────────────────────────────────────────────────────────────────
@@ -165,12 +313,7 @@ class BrowserService:
             pass
         if clear_web_storage:
             try:
-                self.page.evaluate("""
-                    () => {
-                        try { window.localStorage.clear(); } catch(e) {}
-                        try { window.sessionStorage.clear(); } catch(e) {}
-                    }
-                """)
+                self._cdp_eval("window.__auto.clearStorage()")
             except Exception:
                 pass
         logger.info(
@@ -183,44 +326,44 @@ class BrowserService:
     # Popup dismissal
     # ─────────────────────────────────────────────────────────────────────────
 
-    def dismiss_popups(self):
-        """Try common popup/banner/modal close patterns."""
-        candidates = [
-            "button[aria-label='Close']",
-            "button[aria-label='close']",
-            "button:has-text('Accept all')",
-            "button:has-text('Accept')",
-            "button:has-text('Got it')",
-            "button:has-text('Dismiss')",
-            "button:has-text('Not now')",
-            "button:has-text('Skip')",
-            "button:has-text('No thanks')",
-            "button:has-text('Close')",
-            "[data-testid='modal-container'] button:first-child",
-            "[data-testid='closeButton']",
-        ]
-        for sel in candidates:
+    def dismiss_popups(self, max_popups: int = 3):
+        """
+        Close common popup/banner/modal patterns.
+        All candidates are matched by a single locator, so when nothing is
+        showing this costs one 1 s probe instead of one probe per selector.
+        """
+        close = self.page.locator(_POPUP_CLOSE_CSS).or_(
+            self.page.get_by_role('button', name=_POPUP_CLOSE_NAMES)
+        ).first
+        for _ in range(max_popups):
             try:
-                el = self.page.locator(sel).first
-                if el.is_visible(timeout=1500):
-                    el.click(timeout=1500)
-                    self.page.wait_for_timeout(500)
-                    logger.info(f"Popup dismissed: {sel}")
+                close.click(timeout=1000)
             except Exception:
-                pass
+                break
+            self.page.wait_for_timeout(500)
+            logger.info("Popup dismissed")
 
     # ─────────────────────────────────────────────────────────────────────────
-    # Human-like typing
+    # Text input
     # ─────────────────────────────────────────────────────────────────────────
 
-    def type_like_human(self, locator, text: str):
+    def type_like_human(self, locator, text: str, delay: int = 0):
+        """
+        Wait for the element, click it, then type one key event per char.
+        `delay` (ms between keystrokes) is only needed for visual debugging.
+        """
+        locator.wait_for(state='visible')
+        locator.click()
+        locator.type(text, delay=delay)
+
+    def fill_fast(self, locator, text: str):
         """
-        Click the element, wait a moment, then type with 100ms delay per char.
-        Simulates a real user typing.
+        Click the element and set its value in one step (a single input
+        event instead of one key event per char). Autosuggest widgets react
+        to the input event, so this is enough for search fields.
         """
         locator.click()
-        self.page.wait_for_timeout(600)
-        locator.type(text, delay=100)   # Playwright's built-in per-char delay
+        locator.fill(text)
 
     # ─────────────────────────────────────────────────────────────────────────
     # Screenshots disabled
@@ -242,21 +385,96 @@ class BrowserService:
         """
         Wait for a selector to become visible.
         Returns True on success, False on timeout (no exception raised).
+        To act on an element, prefer the action itself (locator.click(),
+        inner_text(), ...) — Playwright auto-waits, saving a round-trip.
         """
         try:
-            self.page.wait_for_selector(selector, state='visible', timeout=timeout)
+            self.page.locator(selector).first.wait_for(state='visible', timeout=timeout)
             return True
         except Exception:
             return False
 
+    def wait_for_url(self, predicate, timeout: int = 15_000) -> bool:
+        """
+        Wait until predicate(url) is true for the page URL.
+        Returns as soon as the URL commits — not on the load event.
+        Returns True on success, False on timeout (no exception raised).
+        """
+        try:
+            self.page.wait_for_url(predicate, wait_until='commit', timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def is_present(self, selector: str) -> bool:
+        """Return whether at least one element matches right now (no waiting)."""
+        try:
+            return self.page.locator(selector).count() > 0
+        except Exception:
+            return False
+
     def scroll_to_bottom(self):
-        self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        self.page.wait_for_timeout(1500)
+        """Scroll down, then wait (max 1.5 s) until lazy content and images stop appearing."""
+        self._cdp_eval("window.__auto.bottom()")
+        try:
+            self.page.wait_for_function(
+                "() => window.__auto.settled()", polling=250, timeout=1500,
+            )
+        except Exception:
+            pass
 
     def scroll_to_top(self):
-        self.page.evaluate("window.scrollTo(0, 0)")
-        self.page.wait_for_timeout(500)
+        self._cdp_eval("window.__auto.top()")
+
+    def _cdp_eval(self, expression: str):
+        """Evaluate a plain JS expression via CDP Runtime.evaluate and return its value."""
+        reply = self._cdp.send('Runtime.evaluate', {
+            'expression':    expression,
+            'returnByValue': True,
+        })
+        if 'exceptionDetails' in reply:
+            raise RuntimeError(f"JS error: {reply['exceptionDetails'].get('text', '')}")
+        return reply.get('result', {}).get('value')
+
+    def js(self, script: str, arg=None):
+        """Run arbitrary JavaScript (optionally with one JSON-able argument) and return the result."""
+        return self.page.evaluate(script, arg)
+
+    def first_visible_text(self, selectors, ignore=(), timeout: int = 0) -> str:
+        """
+        Text of the first visible element matching `selectors` (tried in
+        order) that is non-empty and not in `ignore` — one page call instead
+        of a visibility probe + inner_text() per selector.
+        With a timeout, polls in the page until such text appears.
+        Returns '' when nothing matches (no exception raised).
+        """
+        arg = [list(selectors), [t.lower() for t in ignore]]
+        try:
+            if not timeout:
+                return self.page.evaluate(_FIRST_VISIBLE_TEXT_JS, arg)
+            handle = self.page.wait_for_function(_FIRST_VISIBLE_TEXT_JS, arg=arg, timeout=timeout)
+            return handle.json_value()
+        except Exception:
+            return ''
 
-    def js(self, script: str):
-        """Run arbitrary JavaScript and return the result."""
-        return self.page.evaluate(script)
+    def pick_first_visible(self, candidates, timeout: int = 0):
+        """
+        Locator for the first visible element among `candidates`, tried in
+        priority order — each a CSS selector or a (css, text) pair that also
+        requires the text. One page call, polled in the page with a timeout.
+        Returns None when nothing matches (no exception raised).
+        """
+        arg = [[c, ''] if isinstance(c, str) else [c[0], c[1].lower()] for c in candidates]
+        try:
+            if not timeout:
+                found = self.page.evaluate(_PICK_FIRST_VISIBLE_JS, arg)
+            else:
+                found = self.page.wait_for_function(
+                    _PICK_FIRST_VISIBLE_JS, arg=arg, timeout=timeout,
+                ).json_value()
+        except Exception:
+            return None
+        if not found:
+            return None
+        logger.debug(f"Picked '{found}'")
+        return self.page.locator(f"[{_PICK_ATTR}]").first
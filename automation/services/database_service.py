@@ -3,97 +3,326 @@ DatabaseService
 ===============
 All database write operations in one place.
 Comment format: "should be <expected>, found <actual>"
+
+One DatabaseService instance is created per command run; after
+start_session() every row it writes is linked to that AutomationSession.
 """
+import io
 import logging
-from django.db import connection
-from django.db.utils import ProgrammingError
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils import timezone
+from django.db.utils import OperationalError, ProgrammingError
 from automation.models import (
-    TestResult, ListingData, SuggestionData, NetworkLog, ConsoleLog
+    AutomationSession, TestResult, ListingData, SuggestionData, NetworkLog, ConsoleLog
 )
 
 logger = logging.getLogger(__name__)
 
 _VALID_METHODS = {'GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'OPTIONS'}
 
+_LEVEL_MAP = {
+    'LOG': 'INFO', 'INFO': 'INFO',
+    'WARNING': 'WARNING', 'WARN': 'WARNING',
+    'ERROR': 'ERROR', 'DEBUG': 'DEBUG',
+}
+
+# Log batches bigger than this are written with COPY on PostgreSQL
+_COPY_THRESHOLD = 500
+
+# PostgreSQL accepts at most 65535 bind parameters per statement
+_MAX_QUERY_PARAMS = 65_535
+
+
+def _copy_value(value) -> str:
+    """Encode one field for COPY's text format (tab-separated, \\N = NULL)."""
+    if value is None:
+        return '\\N'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def _batch_size(model) -> int:
+    """Rows per multi-row INSERT: settings.BULK_BATCH_SIZE, capped by the parameter limit."""
+    return min(settings.BULK_BATCH_SIZE, _MAX_QUERY_PARAMS // len(model._meta.concrete_fields))
+
 
 class DatabaseService:
-    @staticmethod
-    def _ensure_table(model):
+
+    # Tables confirmed to exist in this process. Positive results never go
+    # stale within a run, so each table is checked at most once.
+    _known_tables: set = set()
+
+    def __init__(self):
+        self.session: AutomationSession = None
+        self._result_queue: list = []
+        self._writer:  ThreadPoolExecutor = None   # background flush thread, made on first use
+        self._pending: list = []
+
+    @classmethod
+    def _ensure_table(cls, model):
+        """Hot path: a set lookup. Only the first call per table touches the DB."""
+        if model._meta.db_table not in cls._known_tables:
+            cls._check_table(model)
+
+    @classmethod
+    def _check_table(cls, model):
+        """Cold path: confirm the table exists, creating it if it does not."""
         table_name = model._meta.db_table
-        existing_tables = set(connection.introspection.table_names())
-        if table_name in existing_tables:
+        # Probe just this table instead of listing the whole schema. The
+        # savepoint keeps a failed probe from aborting an outer transaction.
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT 1 FROM {connection.ops.quote_name(table_name)} WHERE 1 = 0"
+                )
+            cls._known_tables.add(table_name)
             return
+        except (ProgrammingError, OperationalError):
+            pass
         with connection.schema_editor() as schema_editor:
             schema_editor.create_model(model)
+        cls._known_tables.add(table_name)
         logger.warning(
             "Missing table '%s' was auto-created at runtime. Run migrations to keep schema consistent.",
             table_name,
         )
 
+    # ── Session ───────────────────────────────────────────────────────────────
+
+    def start_session(self, mode: str, headless: bool, target_url: str) -> AutomationSession:
+        DatabaseService._ensure_table(AutomationSession)
+        self.session = AutomationSession.objects.create(
+            mode=mode,
+            headless=headless,
+            target_url=target_url[:2048],
+        )
+        logger.info(f"Automation session #{self.session.pk} started")
+        return self.session
+
     # ── Test results ──────────────────────────────────────────────────────────
 
-    @staticmethod
     def save_result(
+        self,
         test_case: str,
         url: str,
         passed: bool,
         should_be: str,
         found: str,
     ) -> TestResult:
+        """Insert one result immediately and return it (use when the PK is needed)."""
         DatabaseService._ensure_table(TestResult)
+        obj = self._build_result(test_case, url, passed, should_be, found)
+        obj.save()
+        return obj
+
+    def queue_result(
+        self,
+        test_case: str,
+        url: str,
+        passed: bool,
+        should_be: str,
+        found: str,
+    ):
+        """Buffer a result; it is written by the next flush_results() call."""
+        self._result_queue.append(
+            self._build_result(test_case, url, passed, should_be, found)
+        )
+
+    def results_for(self, url: str):
+        """
+        Return queue_result() with `url` pre-bound (and pre-truncated), for
+        steps that record several results against the same page.
+        """
+        return partial(self.queue_result, url=url[:2048])
+
+    def flush_results(self, background: bool = False):
+        """
+        Write every queued result with a single multi-row INSERT.
+        With background=True the INSERT runs on a writer thread so the
+        browser can carry on; call wait_for_writes() before reading back.
+        """
+        if not self._result_queue:
+            return
+        batch, self._result_queue = self._result_queue, []
+        if not background:
+            self._write_results(batch)
+            return
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-writer')
+        self._pending.append(self._writer.submit(self._write_results, batch))
+
+    @contextmanager
+    def batched_results(self, background: bool = True):
+        """
+        Queue every result recorded inside the block and write them with one
+        INSERT on exit — also when the block raises.
+        """
+        try:
+            yield
+        finally:
+            self.flush_results(background=background)
+
+    def wait_for_writes(self, raise_errors: bool = True):
+        """
+        Block until background flushes finish. The first failure is
+        re-raised, or only logged with raise_errors=False.
+        """
+        pending, self._pending = self._pending, []
+        error = None
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Background result write failed: {e}")
+                error = error or e
+        if error and raise_errors:
+            raise error
+
+    def close_writer(self):
+        """Let in-flight flushes finish (never raises), then stop the writer thread."""
+        if self._writer is None:
+            return
+        self.wait_for_writes(raise_errors=False)
+        try:
+            # The writer thread holds its own DB connection — release it
+            self._writer.submit(connections.close_all).result()
+        except Exception as e:
+            logger.warning(f"Could not close the writer's DB connection: {e}")
+        self._writer.shutdown()
+        self._writer = None
+
+    @staticmethod
+    def _write_results(batch: list):
+        DatabaseService._ensure_table(TestResult)
+        TestResult.objects.bulk_create(batch, batch_size=_batch_size(TestResult))
+        logger.info(f"Saved {len(batch)} test results")
+
+    def _build_result(
+        self,
+        test_case: str,
+        url: str,
+        passed: bool,
+        should_be: str,
+        found: str,
+    ) -> TestResult:
+        # Kept as an f-string: it compiles to one BUILD_STRING and beats
+        # ''.join((...)) for this fixed four-fragment shape
         comment = f"should be {should_be}, found {found}"
-        obj = TestResult.objects.create(
+        icon    = '✅' if passed else '❌'
+        logger.info(f"{icon} [{test_case}] {comment}")
+        return TestResult(
             test_case=test_case,
             url=url[:2048],
             passed=passed,
             comment=comment,
+            session=self.session,
         )
-        icon = '✅' if passed else '❌'
-        logger.info(f"{icon} [{test_case}] {comment}")
-        return obj
 
     # ── Suggestions ───────────────────────────────────────────────────────────
 
-    @staticmethod
-    def save_suggestions(texts: list, query: str):
-        DatabaseService._ensure_table(SuggestionData)
-        objs = [
-            SuggestionData(text=t[:512], search_query=query[:255])
+    def save_suggestions(self, texts: list, query: str):
+        if not texts:
+            return
+        session_id = self.session.pk if self.session else None
+        rows = [
+            {'text': t[:512], 'search_query': query[:255], 'session_id': session_id}
             for t in texts if t.strip()
         ]
-        if objs:
-            SuggestionData.objects.bulk_create(objs)
-            logger.info(f"Saved {len(objs)} suggestions for '{query}'")
+        if rows:
+            DatabaseService._ensure_table(SuggestionData)
+            # Duplicates (same query → text from earlier runs) are skipped by
+            # the unique index in the same round-trip
+            saved = DatabaseService._bulk_insert(SuggestionData, rows, ignore_conflicts=True)
+            logger.info(f"Saved {saved} new suggestions for '{query}' ({len(rows) - saved} already known)")
 
     # ── Listings ──────────────────────────────────────────────────────────────
 
-    @staticmethod
-    def save_listings(listings: list):
-        DatabaseService._ensure_table(ListingData)
-        objs = [
+    def save_listings(self, listings: list):
+        if not listings:
+            return
+        # Build model instances lazily, one INSERT-sized batch at a time —
+        # bulk_create() materialises whatever it is given, so feeding it
+        # slices keeps only one batch of instances alive.
+        objs = (
             ListingData(
                 title=item.get('title', '')[:512],
                 price=item.get('price', '')[:100],
                 image_url=item.get('image_url', '')[:2048],
                 listing_url=item.get('listing_url', '')[:2048],
+                session=self.session,
             )
             for item in listings if item.get('title')
-        ]
-        if objs:
-            try:
-                ListingData.objects.bulk_create(objs)
-            except ProgrammingError:
-                # Handles cases where DB schema was changed outside Django migration state.
+        )
+        size  = _batch_size(ListingData)
+        saved = 0
+        while batch := list(islice(objs, size)):
+            if not saved:
                 DatabaseService._ensure_table(ListingData)
-                ListingData.objects.bulk_create(objs)
-            logger.info(f"Saved {len(objs)} listings")
+            ListingData.objects.bulk_create(batch, batch_size=size)
+            saved += len(batch)
+        if saved:
+            logger.info(f"Saved {saved} listings")
+
+    def save_listing_details(self, details: Iterable[dict]):
+        """
+        Upsert several details-page listings keyed by listing_url:
+        one SELECT for the existing rows, then one UPDATE batch and one INSERT.
+        """
+        by_url = {
+            d.get('listing_url', '')[:2048]: d
+            for d in details if d.get('title')
+        }
+        if not by_url:
+            return
+        DatabaseService._ensure_table(ListingData)
+        # listing_url is not unique — like update_or_create, touch one row per URL
+        existing = {}
+        for obj in ListingData.objects.filter(listing_url__in=by_url).order_by('id'):
+            existing[obj.listing_url] = obj
+
+        to_update, to_create = [], []
+        for url, d in by_url.items():
+            obj = existing.get(url) or ListingData(listing_url=url)
+            obj.title     = d['title'][:512]
+            obj.price     = ''
+            obj.image_url = d.get('image_url', '')[:2048]
+            obj.session   = self.session
+            (to_update if obj.pk else to_create).append(obj)
+
+        size = _batch_size(ListingData)
+        with transaction.atomic():
+            if to_update:
+                ListingData.objects.bulk_update(
+                    to_update, ['title', 'price', 'image_url', 'session'], batch_size=size,
+                )
+            if to_create:
+                ListingData.objects.bulk_create(to_create, batch_size=size)
+        for d in by_url.values():
+            logger.info(f"Listing detail saved: {d['title'][:60]}")
 
     # ── Network logs ──────────────────────────────────────────────────────────
 
-    @staticmethod
-    def save_network_logs(logs: list):
-        DatabaseService._ensure_table(NetworkLog)
-        objs = []
+    def save_network_logs(self, logs: Iterable[dict]) -> int:
+        """Insert new (url, method, status) rows; returns how many were actually written."""
+        if not logs:
+            return 0
+        rows = []
+        # Same key as the (url, method, status_code) unique index — repeats
+        # (beacons, polling) are dropped here instead of costing INSERT
+        # parameters and index probes on the server
+        seen = set()
         for log in logs:
             url = log.get('url', '')
             if not url or url.startswith('data:') or url.startswith('blob:'):
@@ -101,34 +330,132 @@ class DatabaseService:
             method = log.get('method', 'GET').upper()
             if method not in _VALID_METHODS:
                 method = 'GET'
-            objs.append(NetworkLog(
-                url=url,
-                method=method,
-                status_code=log.get('status_code'),
-                resource_type=log.get('resource_type', '')[:50],
-            ))
-        if objs:
-            NetworkLog.objects.bulk_create(objs, ignore_conflicts=True)
-            logger.info(f"Saved {len(objs)} network logs")
+            key = (url, method, log.get('status_code'))
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append({
+                'url':           url,
+                'method':        method,
+                'status_code':   log.get('status_code'),
+                'resource_type': log.get('resource_type', '')[:50],
+                'session_id':    self.session.pk if self.session else None,
+            })
+        if not rows:
+            return 0
+        DatabaseService._ensure_table(NetworkLog)
+        saved = self._bulk_insert(NetworkLog, rows, ignore_conflicts=True)
+        logger.info(f"Saved {saved} network logs ({len(rows) - saved} already stored)")
+        return saved
 
     # ── Console logs ──────────────────────────────────────────────────────────
 
-    @staticmethod
-    def save_console_logs(logs: list):
-        DatabaseService._ensure_table(ConsoleLog)
-        level_map = {
-            'LOG': 'INFO', 'INFO': 'INFO',
-            'WARNING': 'WARNING', 'WARN': 'WARNING',
-            'ERROR': 'ERROR', 'DEBUG': 'DEBUG',
-        }
-        objs = [
-            ConsoleLog(
-                level=level_map.get(log.get('level', 'INFO').upper(), 'INFO'),
-                message=log.get('message', '')[:2000],
-                source=log.get('source', '')[:512],
-            )
+    def save_console_logs(self, logs: Iterable[dict]) -> int:
+        """Insert console rows; returns how many were written."""
+        if not logs:
+            return 0
+        rows = [
+            {
+                'level':      _LEVEL_MAP.get(log.get('level', 'INFO').upper(), 'INFO'),
+                'message':    log.get('message', '')[:2000],
+                'source':     log.get('source', '')[:512],
+                'session_id': self.session.pk if self.session else None,
+            }
             for log in logs
         ]
-        if objs:
-            ConsoleLog.objects.bulk_create(objs)
-            logger.info(f"Saved {len(objs)} console logs")
+        if not rows:
+            return 0
+        DatabaseService._ensure_table(ConsoleLog)
+        saved = self._bulk_insert(ConsoleLog, rows)
+        logger.info(f"Saved {saved} console logs")
+        return saved
+
+    def save_session_logs(self, console_logs: Iterable[dict], network_logs: Iterable[dict]) -> tuple:
+        """
+        Persist both monitoring buffers in a single transaction (one commit).
+        Returns the (console, network) row counts actually inserted.
+        """
+        with transaction.atomic():
+            return self.save_console_logs(console_logs), self.save_network_logs(network_logs)
+
+    # ── Bulk insert paths ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def _bulk_insert(model, rows: list, ignore_conflicts: bool = False) -> int:
+        """
+        Insert `rows` (dicts of column attname → value) into `model`'s table
+        and return how many were actually written.
+        On PostgreSQL, large batches go through COPY; smaller conflict-skipping
+        batches use INSERT … ON CONFLICT DO NOTHING, whose rowcount is exact;
+        everything else goes through bulk_create.
+        """
+        if connection.vendor == 'postgresql' and len(rows) > _COPY_THRESHOLD:
+            now = timezone.now()
+            return DatabaseService._bulk_copy(
+                model,
+                [*rows[0], 'captured_at'],
+                [(*row.values(), now) for row in rows],
+                ignore_conflicts=ignore_conflicts,
+            )
+        if ignore_conflicts:
+            return DatabaseService._insert_ignoring_conflicts(model, rows)
+
+        model.objects.bulk_create([model(**row) for row in rows], batch_size=_batch_size(model))
+        return len(rows)
+
+    @staticmethod
+    def _insert_ignoring_conflicts(model, rows: list) -> int:
+        """Multi-row INSERT … ON CONFLICT DO NOTHING; returns the rows actually written."""
+        qn      = connection.ops.quote_name
+        columns = [*rows[0], 'captured_at']
+        now     = connection.ops.adapt_datetimefield_value(timezone.now())
+        size    = min(settings.BULK_BATCH_SIZE, _MAX_QUERY_PARAMS // len(columns),
+                      connection.ops.bulk_batch_size(columns, rows))
+        head    = f"INSERT INTO {qn(model._meta.db_table)} ({', '.join(map(qn, columns))}) VALUES "
+        row_sql = '(' + ', '.join(['%s'] * len(columns)) + ')'
+
+        inserted = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            for start in range(0, len(rows), size):
+                batch = rows[start:start + size]
+                cursor.execute(
+                    head + ', '.join([row_sql] * len(batch)) + ' ON CONFLICT DO NOTHING',
+                    [value for row in batch for value in (*row.values(), now)],
+                )
+                inserted += cursor.rowcount
+        return inserted
+
+    @staticmethod
+    def _bulk_copy(model, columns: list, rows: list, ignore_conflicts: bool = False) -> int:
+        """
+        Stream rows into the table with COPY FROM STDIN (PostgreSQL only).
+        COPY cannot skip duplicates, so with `ignore_conflicts` the rows land
+        in a temp staging table first and are moved over with
+        INSERT ... ON CONFLICT DO NOTHING. Returns the number of rows inserted.
+        """
+        buf = io.StringIO(''.join(
+            '\t'.join(map(_copy_value, row)) + '\n' for row in rows
+        ))
+
+        qn    = connection.ops.quote_name
+        table = qn(model._meta.db_table)
+        cols  = ', '.join(qn(c) for c in columns)
+        with transaction.atomic(), connection.cursor() as cursor:
+            if not ignore_conflicts:
+                cursor.copy_expert(f"COPY {table} ({cols}) FROM STDIN", buf)
+                return len(rows)
+            staging = qn(f"{model._meta.db_table}_staging")
+            # Only the copied columns — LIKE would carry id's NOT NULL but
+            # not its identity default, failing the COPY that omits id
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT {cols} FROM {table} WITH NO DATA"
+            )
+            cursor.copy_expert(f"COPY {staging} ({cols}) FROM STDIN", buf)
+            cursor.execute(
+                f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {staging} "
+                f"ON CONFLICT DO NOTHING"
+            )
+            inserted = cursor.rowcount
+            cursor.execute(f"DROP TABLE {staging}")
+            return inserted
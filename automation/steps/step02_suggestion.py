@@ -16,6 +16,21 @@ from automation.services.database_service import DatabaseService
 
 logger = logging.getLogger(__name__)
 
+_BANNER = "━" * 55
+
+# Runs in the page: trimmed, single-line, non-empty texts (max 200 chars)
+_OPTION_TEXTS_JS = """
+    els => els
+        .map(e => (e.innerText || '').trim().replace(/\\n/g, ' ').slice(0, 200))
+        .filter(Boolean)
+"""
+
+# Any of these means the dropdown is showing; one union so all are probed together
+_DROPDOWN_MARKERS = (
+    "[role='listbox'], [role='option'], "
+    "[data-testid='autocomplete-menu'] >> visible=true"
+)
+
 
 class Step02AutoSuggestion:
 
@@ -24,18 +39,18 @@ class Step02AutoSuggestion:
         self.db      = db
 
     def run(self, search_query: str) -> bool:
-        logger.info("━" * 55)
+        logger.info(_BANNER)
         logger.info("STEP 02: Search Auto-suggestion Verification")
-        logger.info("━" * 55)
+        logger.info(_BANNER)
 
         current_url = self.browser.get_url()
+        record      = self.db.results_for(current_url)
 
         # ── 1. Wait for the suggestion dropdown ───────────────────────────────
         appeared = self._wait_for_dropdown()
 
-        self.db.save_result(
+        record(
             test_case='Auto-suggestion List Visibility',
-            url=current_url,
             passed=appeared,
             should_be='Auto-suggestion dropdown to appear after typing location name into search field',
             found='Suggestion dropdown appeared with location options' if appeared
@@ -51,14 +66,14 @@ class Step02AutoSuggestion:
         logger.info(f"Collected {len(texts)} suggestions: {texts[:3]}")
 
         # ── 3. Relevance check ────────────────────────────────────────────────
-        words    = search_query.lower().split()
+        words    = tuple(search_query.lower().split())
+        lowered  = [s.lower() for s in texts]
         relevant = any(
-            any(word in s.lower() for word in words)
-            for s in texts
+            any(word in low for word in words)
+            for low in lowered
         )
-        self.db.save_result(
+        record(
             test_case='Auto-suggestion Relevance Check',
-            url=current_url,
             passed=relevant,
             should_be=f"Suggestions to be relevant to the entered search term '{search_query}'",
             found=f"{len(texts)} suggestions: {', '.join(texts[:4])}",
@@ -68,9 +83,8 @@ class Step02AutoSuggestion:
         has_icons = self._check_map_icons()
         # Format suggestion list like the assignment PDF screenshot shows
         numbered  = ', '.join(f"{i+1}. {t}" for i, t in enumerate(texts[:8]))
-        self.db.save_result(
+        record(
             test_case='Google Auto Suggestion List Availability Test',
-            url=current_url,
             passed=has_icons,
             should_be=(
                 f"suggested items: i. {search_query}, ii. {search_query} suggestions "
@@ -86,7 +100,7 @@ class Step02AutoSuggestion:
         clicked = self._click_random_suggestion()
         self.browser.wait(3000)
 
-        self.db.save_result(
+        self.db.queue_result(
             test_case='Auto-suggestion Random Selection and Click',
             url=self.browser.get_url(),
             passed=clicked,
@@ -103,17 +117,10 @@ class Step02AutoSuggestion:
 
     def _wait_for_dropdown(self) -> bool:
         """Wait for the suggestion listbox/options to appear."""
-        for sel in [
-            "[role='listbox']",
-            "[role='option']",
-            "[data-testid='autocomplete-menu']",
-        ]:
-            if self.browser.wait_for_selector(sel, timeout=8000):
-                return True
-        return False
+        return self.browser.wait_for_selector(_DROPDOWN_MARKERS, timeout=8000)
 
     def _collect_suggestion_texts(self) -> list:
-        """Extract text from each suggestion option element."""
+        """Extract text from every suggestion option in one browser round-trip per selector."""
         page = self.browser.page
         for sel in (
             "[role='option']",
@@ -121,15 +128,7 @@ class Step02AutoSuggestion:
             "[data-testid='autocomplete-menu'] li",
         ):
             try:
-                items = page.locator(sel).all()
-                texts = []
-                for item in items:
-                    try:
-                        t = item.inner_text().strip().replace('\n', ' ')
-                        if t:
-                            texts.append(t[:200])
-                    except Exception:
-                        pass
+                texts = page.eval_on_selector_all(sel, _OPTION_TEXTS_JS)
                 if texts:
                     return texts
             except Exception:
@@ -138,32 +137,24 @@ class Step02AutoSuggestion:
 
     def _check_map_icons(self) -> bool:
         """Check if suggestion items contain SVG map pin icons."""
-        page = self.browser.page
-        for sel in (
-            "[role='option'] svg",
-            "[role='option'] img",
-            "[role='listbox'] svg",
-        ):
-            try:
-                if page.locator(sel).count() > 0:
-                    return True
-            except Exception:
-                pass
-        return False
+        return self.browser.is_present(
+            "[role='option'] svg, [role='option'] img, [role='listbox'] svg"
+        )
 
     def _click_random_suggestion(self) -> bool:
         """Click a randomly chosen item from the suggestion list."""
-        page = self.browser.page
+        options = self.browser.page.locator("[role='option']")
         try:
-            options = page.locator("[role='option']").all()
-            if not options:
+            # count() + nth() — no Locator per option just to pick one
+            count = options.count()
+            if not count:
                 return False
-            random.choice(options).click()
+            options.nth(random.randrange(count)).click()
             return True
         except Exception:
             # Fallback — click the first option
             try:
-                page.locator("[role='option']").first.click()
+                options.first.click()
                 return True
             except Exception as e:
                 logger.warning(f"Suggestion click error: {e}")
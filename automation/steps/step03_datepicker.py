@@ -18,6 +18,40 @@ from automation.services.database_service import DatabaseService
 
 logger = logging.getLogger(__name__)
 
+_BANNER = "━" * 55
+
+# Runs in the page: index + date value of every enabled, rendered day button
+_AVAILABLE_DAYS_JS = """
+    els => els
+        .map((e, index) => {
+            const box = e.getBoundingClientRect();
+            return {
+                index,
+                usable: !e.disabled && box.width > 0 && box.height > 0,
+                date: e.getAttribute('data-state--date-string')
+                    || e.getAttribute('aria-label')
+                    || (e.innerText || '').trim(),
+            };
+        })
+        .filter(d => d.usable)
+"""
+
+# Any of these opens the calendar; one union so all are probed together
+_DATE_FIELD_TRIGGERS = (
+    "[data-testid='structured-search-input-field-split-dates-0'], "
+    "button[data-testid*='dates'], "
+    ":text('Add dates'), :text('When'), "
+    "button[aria-label*='Check in'] >> visible=true"
+)
+
+# Any of these means the calendar is open (the year heading replaces the old XPath probe)
+_PICKER_MARKERS = (
+    "button[data-state--date-string], "
+    "[data-testid='datepicker-tabs'], "
+    "[class*='CalendarMonth'], "
+    "h2:has-text('2026'), h2:has-text('2027') >> visible=true"
+)
+
 
 class Step03DatePicker:
 
@@ -28,18 +62,18 @@ class Step03DatePicker:
         self.checkout_date = None
 
     def run(self) -> dict:
-        logger.info("━" * 55)
+        logger.info(_BANNER)
         logger.info("STEP 03: Date Picker Interaction")
-        logger.info("━" * 55)
+        logger.info(_BANNER)
 
         current_url = self.browser.get_url()
+        record      = self.db.results_for(current_url)
 
         # ── 1. Verify date picker opened after location selected ──────────────
         picker_visible = self._wait_for_picker()
 
-        self.db.save_result(
+        record(
             test_case='Date Picker Modal Open and Visibility Test',
-            url=current_url,
             passed=picker_visible,
             should_be='Date picker modal to open automatically after location is selected, showing month calendar',
             found='Date picker modal is visible and showing month calendar' if picker_visible
@@ -56,9 +90,8 @@ class Step03DatePicker:
         num_clicks  = random.randint(3, 8)
         actual_clicks = self._click_next_month(num_clicks)
 
-        self.db.save_result(
+        record(
             test_case='Refine Button Date Validation Test',
-            url=current_url,
             passed=actual_clicks > 0,
             should_be=f'Next Month button to be clicked {num_clicks} times to navigate forward in calendar',
             found=f'Successfully clicked Next Month button {actual_clicks} times',
@@ -73,7 +106,7 @@ class Step03DatePicker:
         self.browser.wait(1500)
 
         # ── 5. Store dates and validate ───────────────────────────────────────
-        self.db.save_result(
+        self.db.queue_result(
             test_case='Date Selection — Check-in and Check-out Validation',
             url=self.browser.get_url(),
             passed=ci_ok and co_ok,
@@ -89,45 +122,17 @@ class Step03DatePicker:
 
     def _wait_for_picker(self) -> bool:
         """Check if the calendar/date picker widget is visible."""
-        css_selectors = [
-            "button[data-state--date-string]",
-            "[data-testid='datepicker-tabs']",
-            "[class*='CalendarMonth']",
-        ]
-        for sel in css_selectors:
-            if self.browser.wait_for_selector(sel, timeout=6000):
-                return True
-        # XPath for year heading
-        try:
-            self.browser.page.wait_for_selector(
-                "xpath=//h2[contains(text(),'2026') or contains(text(),'2027')]",
-                state='visible', timeout=5000
-            )
-            return True
-        except Exception:
-            pass
-        return False
+        return self.browser.wait_for_selector(_PICKER_MARKERS, timeout=6000)
 
     def _try_open_date_field(self):
         """Click the When / date area to force the picker to open."""
-        page = self.browser.page
-        selectors = [
-            "[data-testid='structured-search-input-field-split-dates-0']",
-            "button[data-testid*='dates']",
-            "text=Add dates",
-            "text=When",
-            "button[aria-label*='Check in']",
-        ]
-        for sel in selectors:
-            try:
-                el = page.locator(sel).first
-                if el.is_visible(timeout=3000):
-                    el.click()
-                    self.browser.wait(2000)
-                    logger.info(f"Date picker opened by clicking: {sel}")
-                    return
-            except Exception:
-                pass
+        if not self.browser.wait_for_selector(_DATE_FIELD_TRIGGERS, timeout=3000):
+            return
+        try:
+            self.browser.page.locator(_DATE_FIELD_TRIGGERS).first.click()
+            logger.info("Date picker opened by clicking the date field")
+        except Exception:
+            pass
 
     def _click_next_month(self, count: int) -> int:
         """
@@ -166,8 +171,11 @@ class Step03DatePicker:
 
     def _get_available_days(self) -> list:
         """
-        Return enabled (non-disabled) day buttons from the current calendar view.
+        Return (Locator, date string) pairs for enabled, visible day buttons
+        in the current calendar view.
         Real Airbnb DOM: button[data-state--date-string] that are not aria-disabled.
+        Filtering and date reading happen in one in-page call; only the day
+        that is eventually clicked costs another round-trip.
         """
         page = self.browser.page
         for sel in (
@@ -175,11 +183,10 @@ class Step03DatePicker:
             "button[data-state--date-string][tabindex='0']",
         ):
             try:
-                buttons   = page.locator(sel).all()
-                available = [b for b in buttons if b.is_enabled() and b.is_visible()]
-                if available:
-                    logger.info(f"Found {len(available)} available days")
-                    return available
+                days = page.eval_on_selector_all(sel, _AVAILABLE_DAYS_JS)
+                if days:
+                    logger.info(f"Found {len(days)} available days")
+                    return [(page.locator(sel).nth(d['index']), d['date']) for d in days]
             except Exception:
                 pass
         return []
@@ -198,14 +205,7 @@ class Step03DatePicker:
 
         try:
             idx = max(0, len(days) // 4) if is_checkin else min(len(days) // 4 + 7, len(days) - 1)
-            day = days[idx]
-
-            # Try to read the actual date value
-            date_str = (
-                day.get_attribute('data-state--date-string')
-                or day.get_attribute('aria-label')
-                or day.inner_text().strip()
-            )
+            day, date_str = days[idx]
 
             day.click()
 
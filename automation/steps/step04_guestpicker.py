@@ -18,6 +18,8 @@ from automation.services.database_service import DatabaseService
 
 logger = logging.getLogger(__name__)
 
+_BANNER = "━" * 55
+
 # Real Airbnb stepper buttons confirmed from DOM inspection
 _STEPPER_INCREASE = [
     "[data-testid='stepper-adults-increase-button']",
@@ -26,6 +28,26 @@ _STEPPER_INCREASE = [
     "[data-testid='stepper-pets-increase-button']",
 ]
 
+# "Who" field — shows the running guest total once guests are added
+_GUEST_FIELD = "[data-testid='structured-search-input-field-guests-btn']"
+# Where the guest total is read back from, in priority order
+_GUEST_DISPLAY = (_GUEST_FIELD, "button[aria-label*='guest']")
+
+# Click targets in priority order — resolved with one page call by
+# BrowserService.pick_first_visible; (css, text) pairs also require the text
+_GUEST_TRIGGERS = (
+    _GUEST_FIELD,
+    ('body *', 'Add guests'),
+    ('body *', 'Who'),
+    "button[aria-label*='guest' i]",
+)
+_SEARCH_BUTTONS = (
+    "[data-testid='structured-search-input-search-button']",
+    "button[aria-label='Search']",
+    ('button', 'Search'),
+    "button[type='submit']",
+)
+
 
 class Step04GuestPicker:
 
@@ -33,20 +55,23 @@ class Step04GuestPicker:
         self.browser      = browser
         self.db           = db
         self.total_guests = 0
+        # Locators are lazy and reusable — build them once per step
+        self._page        = browser.page
+        self._steppers    = [(sel, self._page.locator(sel).first) for sel in _STEPPER_INCREASE]
 
     def run(self) -> int:
-        logger.info("━" * 55)
+        logger.info(_BANNER)
         logger.info("STEP 04: Guest Picker Interaction")
-        logger.info("━" * 55)
+        logger.info(_BANNER)
 
-        current_url = self.browser.get_url()
+        # The picker is an in-page popup — the URL only changes on Search
+        record = self.db.results_for(self.browser.get_url())
 
         # ── 1. Click the Who / Add guests field ───────────────────────────────
         opened = self._open_guest_picker()
 
-        self.db.save_result(
+        record(
             test_case='Guest Picker Open Verification',
-            url=current_url,
             passed=opened,
             should_be='Guest selection popup to open with Adults, Children, Infants and Pets sections',
             found='Guest picker opened successfully with stepper controls visible' if opened
@@ -59,13 +84,13 @@ class Step04GuestPicker:
         # ── 2. Randomly add 2-5 guests ────────────────────────────────────────
         target            = random.randint(2, 5)
         self.total_guests = self._add_guests(target)
-        self.browser.wait(800)
+        # The field re-renders with "N guests" once the steppers settle
+        self.browser.wait_for_selector(f"{_GUEST_FIELD}:has-text('guest')", timeout=2000)
 
         # ── 3. Verify count shown in the field ────────────────────────────────
         display_text = self._read_guest_field()
-        self.db.save_result(
+        record(
             test_case='Guest Count Display Verification',
-            url=self.browser.get_url(),
             passed=self.total_guests > 0,
             should_be=f'Guest input field to show {self.total_guests} guest(s) selected',
             found=f'Guest field currently shows: "{display_text}"',
@@ -73,9 +98,11 @@ class Step04GuestPicker:
 
         # ── 4. Click the Search button ────────────────────────────────────────
         searched = self._click_search()
-        self.browser.wait(5000)   # wait for results page to begin loading
+        if searched:
+            # Results page URL carries the guest params (or at least /s/)
+            self.browser.wait_for_url(lambda u: 'adults' in u.lower() or '/s/' in u, timeout=15000)
 
-        self.db.save_result(
+        self.db.queue_result(
             test_case='Search Button Click After Guest Selection',
             url=self.browser.get_url(),
             passed=searched,
@@ -91,87 +118,60 @@ class Step04GuestPicker:
     # ─────────────────────────────────────────────────────────────────────────
 
     def _open_guest_picker(self) -> bool:
-        page = self.browser.page
-        selectors = [
-            "[data-testid='structured-search-input-field-guests-btn']",
-            "text=Add guests",
-            "text=Who",
-            "button[aria-label*='guest']",
-            "button[aria-label*='Guest']",
-        ]
-        for sel in selectors:
-            try:
-                el = page.locator(sel).first
-                if el.is_visible(timeout=4000):
-                    el.click()
-                    self.browser.wait(2000)
-                    # Confirm it opened — check for Adults stepper or text
-                    if page.locator(_STEPPER_INCREASE[0]).is_visible(timeout=3000):
-                        logger.info(f"Guest picker confirmed open via: {sel}")
-                        return True
-                    if page.locator("text=Adults").is_visible(timeout=2000):
-                        return True
-                    return True   # opened even if we can't verify steppers
-            except Exception:
-                pass
-        return False
+        trigger = self.browser.pick_first_visible(_GUEST_TRIGGERS, timeout=4000)
+        if trigger is None:
+            return False
+        try:
+            trigger.click()
+        except Exception:
+            return False
+        # Confirm it opened — Adults stepper or "Adults" label, whichever renders first
+        popup = self._steppers[0][1].or_(self._page.get_by_text('Adults', exact=True))
+        try:
+            popup.first.wait_for(state='visible', timeout=3000)
+            logger.info("Guest picker confirmed open")
+        except Exception:
+            pass
+        return True   # opened even if we can't verify steppers
 
     def _add_guests(self, target: int) -> int:
         """
         Click stepper increase buttons to add guests.
         Distributes clicks randomly across Adults/Children/Infants/Pets.
         """
-        page    = self.browser.page
-        success = 0
+        success  = 0
+        attempts = 0
+        backoff  = 100   # ms; doubles on consecutive failures, reset on success
 
-        for _ in range(target * 5):   # extra attempts to handle flakiness
-            if success >= target:
-                break
-            sel = random.choice(_STEPPER_INCREASE)
+        while success < target and attempts < target * 3:
+            attempts += 1
+            sel, btn = random.choice(self._steppers)
             try:
-                btn = page.locator(sel).first
-                if btn.is_visible(timeout=2000) and btn.is_enabled():
-                    btn.click()
-                    self.browser.wait(400)
-                    success += 1
-                    logger.info(f"  Guest #{success} added via {sel}")
+                # click() waits for the button to be visible and enabled
+                btn.click(timeout=1500)
+                success += 1
+                backoff  = 100
+                logger.info(f"  Guest #{success} added via {sel}")
             except Exception as e:
                 logger.debug(f"Stepper click failed ({sel}): {e}")
+                backoff = min(backoff * 2, 1600)
+            self.browser.wait(backoff)
 
         logger.info(f"Total guests added: {success} (target was {target})")
         return success
 
     def _read_guest_field(self) -> str:
         """Read what the guest / Who field currently shows."""
-        page = self.browser.page
-        for sel in (
-            "[data-testid='structured-search-input-field-guests-btn']",
-            "button[aria-label*='guest']",
-        ):
-            try:
-                txt = page.locator(sel).first.inner_text().strip()
-                if txt:
-                    return txt
-            except Exception:
-                pass
-        return str(self.total_guests)
+        return self.browser.first_visible_text(_GUEST_DISPLAY, timeout=3000) or str(self.total_guests)
 
     def _click_search(self) -> bool:
         """Click the Search button to run the search."""
-        page = self.browser.page
-        selectors = [
-            "[data-testid='structured-search-input-search-button']",
-            "button[aria-label='Search']",
-            "button:has-text('Search')",
-            "button[type='submit']",
-        ]
-        for sel in selectors:
-            try:
-                btn = page.locator(sel).first
-                if btn.is_visible(timeout=4000):
-                    btn.click()
-                    logger.info(f"Search button clicked: {sel}")
-                    return True
-            except Exception:
-                pass
-        return False
+        button = self.browser.pick_first_visible(_SEARCH_BUTTONS, timeout=4000)
+        if button is None:
+            return False
+        try:
+            button.click()
+            logger.info("Search button clicked")
+            return True
+        except Exception:
+            return False
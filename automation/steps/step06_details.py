@@ -8,6 +8,10 @@ Assignment requirements:
 ✓ Capture listing title (h1) and subtitle (h2)
 ✓ Collect all available image URLs from gallery
 ✓ Store collected details in database
+
+Besides the randomly selected listing, the top few other listings from
+the results are opened in parallel background tabs and their details stored
+as well — the page loads overlap, so this costs about one page load.
 """
 import random
 import logging
@@ -15,25 +19,79 @@ from urllib.parse import urljoin
 
 from automation.services.browser_service  import BrowserService
 from automation.services.database_service import DatabaseService
-from automation.models                    import ListingData
 
 logger = logging.getLogger(__name__)
 
+_BANNER = "━" * 55
+
+# Subtitle candidates in priority order, evaluated in-page by _TAB_DETAILS_JS
+_SUBTITLE_SELECTORS = [
+    "[data-section-id='OVERVIEW_DEFAULT_V2'] h2",
+    "[data-plugin-in-point-id='OVERVIEW_DEFAULT_V2'] h2",
+    "h2",   # generic fallback — keep last
+]
+
+# Airbnb serves listing photos from the muscache.com CDN
+_GALLERY_JS = """
+    () => {
+        // The CDN serves each photo at several sizes (?im_w=320, 720, 1200 ...):
+        // key on the path and keep the widest variant
+        const best = new Map();
+        const re   = /https?:\\/\\/[^\\s,]*muscache\\.com[^\\s,]*/g;
+        const imgs = document.images;   // live collection — no NodeList copy
+        for (let i = 0; i < imgs.length; i++) {
+            const img = imgs[i];
+            // One regex scan over src, data-src, data-original-uri and srcset
+            const blob = [img.src, img.dataset.src, img.dataset.originalUri, img.srcset].join(' ');
+            for (const src of blob.match(re) || []) {
+                const key   = src.split('?')[0];
+                const width = parseInt((src.match(/[?&]im_w=(\\d+)/) || [])[1] || '0', 10);
+                const prev  = best.get(key);
+                if (!prev || prev.width < width) best.set(key, {src, width});
+            }
+        }
+        return [...best.values()].map(v => v.src);
+    }
+"""
+
+# Runs in the page: raw href of the first 10 room links — no Locator per link
+_ROOM_HREFS_JS = "els => els.slice(0, 10).map(a => a.getAttribute('href')).filter(Boolean)"
+
+_TAB_DETAILS_JS = """
+    (subtitleSelectors) => {
+        const text = el => (el && el.innerText || '').trim();
+        // First rendered match per candidate, candidates in priority order
+        const shown = sel => [...document.querySelectorAll(sel)]
+            .find(el => el.getClientRects().length);
+        let subtitle = '';
+        for (const sel of subtitleSelectors) {
+            subtitle = text(shown(sel));
+            if (subtitle) break;
+        }
+        return {title: text(document.querySelector('h1')), subtitle};
+    }
+"""
+
 
 class Step06ListingDetails:
 
     def __init__(self, browser: BrowserService, db: DatabaseService):
         self.browser = browser
         self.db      = db
+        self._page   = browser.page
 
-    def run(self, listings: list) -> dict:
-        logger.info("━" * 55)
+    def run(self, listings: list, sample_size: int = 5) -> dict:
+        """
+        Verify one random listing's details page, then fetch details for the
+        top `sample_size - 1` other listings in parallel tabs.
+        """
+        logger.info(_BANNER)
         logger.info("STEP 06: Item Details Page Verification")
-        logger.info("━" * 55)
+        logger.info(_BANNER)
 
         if not listings:
             logger.warning("No listings from step 05 — cannot open details page")
-            self.db.save_result(
+            self.db.queue_result(
                 test_case='Listing Details Page Load',
                 url=self.browser.get_url(),
                 passed=False,
@@ -47,14 +105,12 @@ class Step06ListingDetails:
         logger.info(f"Selected listing: {listing.get('title', '?')[:60]}")
 
         opened = self._navigate_to_listing(listing)
-        self.browser.wait(4000)
-
         current_url = self.browser.get_url()
+        record      = self.db.results_for(current_url)
 
         page_ok = '/rooms/' in current_url
-        self.db.save_result(
+        record(
             test_case='Listing Details Page Load',
-            url=current_url,
             passed=page_ok,
             should_be='Listing details page to open with /rooms/ in URL and full listing visible',
             found=f"Page {'opened successfully' if page_ok else 'FAILED to open'}: {current_url[:100]}",
@@ -66,9 +122,8 @@ class Step06ListingDetails:
         # ── 3. Capture subtitle (h2) ──────────────────────────────────────────
         subtitle = self._get_h2_subtitle()
 
-        self.db.save_result(
+        record(
             test_case='Listing Title and Subtitle Capture',
-            url=current_url,
             passed=bool(title),
             should_be='Listing h1 title and h2 subtitle to be captured from the details page',
             found=f"h1 Title: '{title[:80]}' | h2 Subtitle: '{subtitle[:80]}'",
@@ -77,22 +132,30 @@ class Step06ListingDetails:
         # ── 4. Collect all gallery image URLs ─────────────────────────────────
         image_urls = self._collect_gallery_images()
 
-        self.db.save_result(
+        record(
             test_case='Listing Gallery Image URLs Collection',
-            url=current_url,
             passed=len(image_urls) > 0,
             should_be='All available gallery image URLs to be collected from the listing photo section',
             found=f'Collected {len(image_urls)} image URLs from the listing gallery',
         )
 
-        # ── 5. Store everything in DB ─────────────────────────────────────────
+        # ── 5. Assemble the primary result ────────────────────────────────────
         result = {
             'title':      title,
             'subtitle':   subtitle,
             'image_urls': image_urls,
             'url':        current_url,
         }
-        self._persist(result)
+
+        # ── 6. Top results — loaded concurrently in background tabs ───────────
+        # Step 05 already stored every listing; these are the next best-ranked
+        # ones in page order, so repeated runs enrich the same rows
+        others = [l for l in listings if l is not listing]
+        extras = self._scrape_details_in_tabs(others[:max(sample_size - 1, 0)])
+
+        # ── 7. Store everything in DB — one upsert for all listings ───────────
+        self._persist([result, *extras])
+
         return result
 
     # ─────────────────────────────────────────────────────────────────────────
@@ -101,7 +164,6 @@ class Step06ListingDetails:
 
     def _navigate_to_listing(self, listing: dict) -> bool:
         """Navigate to a listing's detail page."""
-        page        = self.browser.page
         listing_url = listing.get('listing_url', '')
 
         # Direct navigation if we have a rooms URL
@@ -110,27 +172,29 @@ class Step06ListingDetails:
             if '/rooms/' in listing_url:
                 try:
                     self.browser.navigate(listing_url)
-                    self.browser.wait(3000)
-                    return '/rooms/' in self.browser.get_url()
+                    return self._wait_for_details_page()
                 except Exception as e:
                     logger.warning(f"Direct listing navigation failed: {e}")
 
-        # Click the first available room link on the current page
+        # Follow one of the first room links on the current page
         try:
-            links = page.locator("a[href*='/rooms/']").all()
-            if links:
-                pick = random.choice(links[:10])
-                href = pick.get_attribute('href') or ''
-                if href:
-                    href = self._normalize_airbnb_url(href)
-                    self.browser.navigate(href)
-                    self.browser.wait(3000)
-                    return '/rooms/' in self.browser.get_url()
+            hrefs = self._page.eval_on_selector_all("a[href*='/rooms/']", _ROOM_HREFS_JS)
+            if hrefs:
+                href = self._normalize_airbnb_url(random.choice(hrefs))
+                self.browser.navigate(href)
+                return self._wait_for_details_page()
         except Exception as e:
             logger.warning(f"Room link click failed: {e}")
 
         return False
 
+    def _wait_for_details_page(self) -> bool:
+        """Wait for a /rooms/ URL, then for the title heading to render."""
+        if not self.browser.wait_for_url(lambda u: '/rooms/' in u, timeout=15000):
+            return False
+        self.browser.wait_for_selector('h1', timeout=10000)
+        return True
+
     def _normalize_airbnb_url(self, raw_url: str) -> str:
         """Normalize scraped Airbnb listing URLs into valid absolute HTTPS URLs."""
         raw = (raw_url or '').strip()
@@ -148,14 +212,13 @@ class Step06ListingDetails:
 
     def _get_h1_title(self) -> str:
         """Get the listing title from the h1 element."""
-        page = self.browser.page
+        page = self._page
         try:
-            el = page.locator('h1').first
-            if el.is_visible(timeout=6000):
-                txt = el.inner_text().strip()
-                if txt:
-                    logger.info(f"Title (h1): {txt[:70]}")
-                    return txt
+            # inner_text() auto-waits for the element — no separate visibility probe
+            txt = page.locator('h1').first.inner_text(timeout=6000).strip()
+            if txt:
+                logger.info(f"Title (h1): {txt[:70]}")
+                return txt
         except Exception as e:
             logger.warning(f"h1 title error: {e}")
         return ''
@@ -166,66 +229,73 @@ class Step06ListingDetails:
         On real Airbnb this sits inside data-section-id='OVERVIEW_DEFAULT_V2'.
         Example: "Room in Greater London, United Kingdom"
         """
-        page = self.browser.page
-        selectors = [
-            "[data-section-id='OVERVIEW_DEFAULT_V2'] h2",
-            "[data-plugin-in-point-id='OVERVIEW_DEFAULT_V2'] h2",
-            "h2",   # generic fallback
-        ]
-        for sel in selectors:
-            try:
-                el = page.locator(sel).first
-                if el.is_visible(timeout=3000):
-                    txt = el.inner_text().strip()
-                    if txt:
-                        logger.info(f"Subtitle (h2): {txt[:70]}")
-                        return txt
-            except Exception:
-                pass
-        return ''
+        # Wait for the overview heading itself; a bare h2 elsewhere on the
+        # page must not end the wait before it renders
+        overview = ', '.join(_SUBTITLE_SELECTORS[:-1])
+        if not self.browser.wait_for_selector(overview, timeout=3000):
+            if not self.browser.wait_for_selector('h2', timeout=3000):
+                return ''
+        try:
+            txt = self._page.evaluate(_TAB_DETAILS_JS, _SUBTITLE_SELECTORS)['subtitle']
+        except Exception:
+            return ''
+        if txt:
+            logger.info(f"Subtitle (h2): {txt[:70]}")
+        return txt
 
     def _collect_gallery_images(self) -> list:
         """
         Collect all gallery image URLs using JS.
         Airbnb serves images from the muscache.com CDN.
         """
-        images = self.browser.js("""
-            () => {
-                const urls = new Set();
-                document.querySelectorAll('img').forEach(img => {
-                    [img.src, img.dataset.src, img.dataset.originalUri].forEach(src => {
-                        if (src && src.includes('muscache.com') && !src.startsWith('data:')) {
-                            urls.add(src);
-                        }
-                    });
-                    // Parse srcset too
-                    (img.srcset || '').split(',').forEach(part => {
-                        const u = part.trim().split(' ')[0];
-                        if (u && u.includes('muscache.com')) {
-                            urls.add(u);
-                        }
-                    });
-                });
-                return [...urls];
-            }
-        """)
+        images = self.browser.js(_GALLERY_JS)
         logger.info(f"Gallery images collected: {len(images)}")
         return images
 
-    def _persist(self, result: dict):
-        """Upsert listing detail record into ListingData table."""
+    def _scrape_details_in_tabs(self, listings: list) -> list:
+        """Open the listings' detail pages in parallel tabs and scrape each one."""
+        urls = [
+            url for url in (
+                self._normalize_airbnb_url(l.get('listing_url', '')) for l in listings
+            )
+            if '/rooms/' in url
+        ]
+        if not urls:
+            return []
+
+        results = []
+        for tab in self.browser.open_tabs(urls):
+            try:
+                # Same h1 wait as the main path — a title still rendering at
+                # domcontentloaded would otherwise come back empty
+                try:
+                    tab.locator('h1').first.wait_for(state='visible', timeout=10000)
+                except Exception:
+                    pass
+                details = tab.evaluate(_TAB_DETAILS_JS, _SUBTITLE_SELECTORS)
+                results.append({
+                    'title':      details.get('title', ''),
+                    'subtitle':   details.get('subtitle', ''),
+                    'image_urls': tab.evaluate(_GALLERY_JS),
+                    'url':        tab.url,
+                })
+            except Exception as e:
+                logger.warning(f"Tab scrape failed for {tab.url}: {e}")
+            finally:
+                tab.close()
+        logger.info(f"Scraped {len(results)} additional listing detail pages in parallel")
+        return results
+
+    def _persist(self, results: list):
+        """Upsert the scraped listing details into the ListingData table."""
         try:
-            title  = result.get('title', '')
-            images = result.get('image_urls', [])
-            if title:
-                ListingData.objects.update_or_create(
-                    listing_url=result.get('url', '')[:2048],
-                    defaults={
-                        'title':     title[:512],
-                        'price':     '',
-                        'image_url': images[0][:2048] if images else '',
-                    },
-                )
-                logger.info(f"Listing detail saved: {title[:60]}")
+            self.db.save_listing_details(
+                {
+                    'listing_url': r.get('url', ''),
+                    'title':       r.get('title', ''),
+                    'image_url':   (r.get('image_urls') or [''])[0],
+                }
+                for r in results
+            )
         except Exception as e:
-            logger.warning(f"Failed to persist listing detail: {e}")
+            logger.warning(f"Failed to persist listing details: {e}")
@@ -0,0 +1,57 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from automation.models import AutomationSession, NetworkLog, SuggestionData
+from automation.services.database_service import DatabaseService
+
+
+class _LogRowsMixin:
+
+    def setUp(self):
+        self.session = AutomationSession.objects.create(mode='desktop', headless=True, target_url='x')
+
+    def _rows(self, n, status=200):
+        return [
+            {'url': f'https://example.com/{i}', 'method': 'GET', 'status_code': status,
+             'resource_type': 'xhr', 'session_id': self.session.pk}
+            for i in range(n)
+        ]
+
+
+@skipUnless(connection.vendor == 'postgresql', 'COPY paths are PostgreSQL-only')
+class BulkCopyTests(_LogRowsMixin, TestCase):
+
+    def test_copy_with_conflicts_skips_existing_rows(self):
+        rows = self._rows(600)
+        self.assertEqual(DatabaseService._bulk_insert(NetworkLog, rows, ignore_conflicts=True), 600)
+        # Same keys again plus 10 new ones — only the new ones are written
+        rows += self._rows(10, status=404)
+        self.assertEqual(DatabaseService._bulk_insert(NetworkLog, rows, ignore_conflicts=True), 10)
+        self.assertEqual(NetworkLog.objects.count(), 610)
+
+    def test_plain_copy_assigns_ids(self):
+        DatabaseService._bulk_insert(NetworkLog, self._rows(600))
+        self.assertFalse(NetworkLog.objects.filter(id__isnull=True).exists())
+        self.assertEqual(NetworkLog.objects.count(), 600)
+
+
+class InsertIgnoringConflictsTests(_LogRowsMixin, TestCase):
+
+    def test_small_batch_reports_only_new_rows(self):
+        rows = self._rows(20)
+        self.assertEqual(DatabaseService._bulk_insert(NetworkLog, rows, ignore_conflicts=True), 20)
+        rows += self._rows(5, status=404)
+        self.assertEqual(DatabaseService._bulk_insert(NetworkLog, rows, ignore_conflicts=True), 5)
+        self.assertEqual(NetworkLog.objects.count(), 25)
+        self.assertFalse(NetworkLog.objects.filter(captured_at__isnull=True).exists())
+
+    def test_save_suggestions_skips_known_texts(self):
+        db = DatabaseService()
+        db.session = self.session
+        db.save_suggestions(['Paris', 'Lyon', ' '], 'fr')
+        with self.assertLogs('automation.services.database_service', 'INFO') as logs:
+            db.save_suggestions(['Paris', 'Nice'], 'fr')
+        self.assertIn('Saved 1 new suggestions', logs.output[-1])
+        self.assertEqual(SuggestionData.objects.count(), 3)